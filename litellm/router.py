@@ -3858,6 +3858,8 @@ class Router:
                 _model_name: _model_info,
             }
         )
+        # register_model extends litellm's model lists, which provider resolution depends on
+        ProviderBudgetLimiting.clear_provider_resolution_cache()
 
         ## Check if LLM Deployment is allowed for this deployment
         if self.deployment_is_active_for_environment(deployment=deployment) is not True:
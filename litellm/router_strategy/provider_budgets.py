@@ -20,7 +20,18 @@ anthropic:
 
 import asyncio
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypedDict, Union
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 import litellm
 from litellm._logging import verbose_router_logger
@@ -33,7 +44,6 @@ from litellm.router_utils.cooldown_callbacks import (
     _get_prometheus_logger_from_callbacks,
 )
 from litellm.types.router import (
-    LiteLLM_Params,
     ProviderBudgetConfigType,
     ProviderBudgetInfo,
     RouterErrors,
@@ -48,12 +58,52 @@ else:
     Span = Any
 
 DEFAULT_REDIS_SYNC_INTERVAL = 1
+DEFAULT_MAX_PENDING_REDIS_WRITES = 256
+
+# {time_period: ttl_seconds} - e.g. {"1d": 86400}
+_TTL_CACHE: Dict[str, int] = {}
+
+
+def get_ttl_seconds(time_period: str) -> int:
+    """
+    Returns the ttl in seconds for a budget time_period - e.g. '1d' -> 86400
+
+    Fixed length periods are parsed once and cached. Calendar based periods (e.g. '1mo') depend on the current date, so they are computed on every call.
+    """
+    ttl_seconds = _TTL_CACHE.get(time_period)
+    if ttl_seconds is not None:
+        return ttl_seconds
+    ttl_seconds = duration_in_seconds(time_period)
+    if not time_period.endswith("mo"):
+        _TTL_CACHE[time_period] = ttl_seconds
+    return ttl_seconds
+
+
+@lru_cache(maxsize=4096)
+def _resolve_provider(
+    model: str, custom_llm_provider: Optional[str], api_base: Optional[str]
+) -> str:
+    """
+    Cached wrapper around `litellm.get_llm_provider`, returns the custom_llm_provider
+
+    The result also depends on litellm's global model / provider lists (e.g. `litellm.anthropic_models`, `litellm.provider_list`), which `litellm.register_model` extends.
+    The cache is cleared when a ProviderBudgetLimiting is initialized and when the Router adds a deployment (it calls `register_model` for each one) - see `ProviderBudgetLimiting.clear_provider_resolution_cache`.
+    """
+    _, provider, _, _ = litellm.get_llm_provider(
+        model=model,
+        custom_llm_provider=custom_llm_provider,
+        api_base=api_base,
+    )
+    return provider
 
 
 class ProviderBudgetLimiting(CustomLogger):
     def __init__(self, router_cache: DualCache, provider_budget_config: dict):
         self.router_cache = router_cache
         self.redis_increment_operation_queue: List[RedisPipelineIncrementOperation] = []
+        # background Redis writes - kept here so they are not garbage collected before completing
+        self._pending_redis_writes: Set[asyncio.Task] = set()
+        self.clear_provider_resolution_cache()
         asyncio.create_task(self.periodic_sync_in_memory_spend_with_redis())
 
         # cast elements of provider_budget_config to ProviderBudgetInfo
@@ -74,6 +124,25 @@ class ProviderBudgetLimiting(CustomLogger):
             f"Initalized Provider budget config: {self.provider_budget_config}"
         )
 
+        # precompute per-provider budget info as plain values - these are static, no need to rebuild them or read pydantic attributes on every request
+        # {provider: (budget_limit, time_period, spend_key, start_time_key)}
+        self._compiled_budget: Dict[str, Tuple[float, str, str, str]] = {}
+        for provider, config in self.provider_budget_config.items():
+            self._compiled_budget[provider] = (
+                config.budget_limit,
+                config.time_period,
+                f"provider_spend:{provider}:{config.time_period}",
+                f"provider_budget_start_time:{provider}",
+            )
+            # warm the ttl cache, so the logging path only does a dict lookup
+            try:
+                get_ttl_seconds(config.time_period)
+            except ValueError as e:
+                # don't block router init on an invalid time_period, spend tracking for this provider will fail on success logging
+                verbose_router_logger.error(
+                    f"Invalid time_period={config.time_period} for provider {provider} in provider_budget_config: {str(e)}"
+                )
+
         # Add self to litellm callbacks if it's a list
         if isinstance(litellm.callbacks, list):
             litellm.callbacks.append(self)  # type: ignore
@@ -86,6 +155,7 @@ class ProviderBudgetLimiting(CustomLogger):
         """
         Filter out deployments that have exceeded their provider budget limit.
 
+        Deployments of providers without a budget config are not filtered.
 
         Example:
         if deployment = openai/gpt-3.5-turbo
@@ -108,56 +178,56 @@ class ProviderBudgetLimiting(CustomLogger):
             request_kwargs
         )
 
-        # Collect all providers and their budget configs
-        # {"openai": ProviderBudgetInfo, "anthropic": ProviderBudgetInfo, "azure": None}
-        _provider_configs: Dict[str, Optional[ProviderBudgetInfo]] = {}
+        # Single pass: resolve the provider for each deployment, and collect the budget limit + spend cache key for each budgeted provider
+        # {"openai": 100.0, "anthropic": 50.0}
+        deployment_providers: List[Tuple[Dict, Optional[str]]] = []
+        provider_budget_limits: Dict[str, float] = {}
+        cache_keys: List[str] = []
         for deployment in healthy_deployments:
             provider = self._get_llm_provider_for_deployment(deployment)
-            if provider is None:
+            deployment_providers.append((deployment, provider))
+            if provider is None or provider in provider_budget_limits:
+                continue
+            compiled_budget = self._compiled_budget.get(provider)
+            if compiled_budget is None:
                 continue
-            budget_config = self._get_budget_config_for_provider(provider)
-            _provider_configs[provider] = budget_config
-
-        # Filter out providers without budget config
-        provider_configs: Dict[str, ProviderBudgetInfo] = {
-            provider: config
-            for provider, config in _provider_configs.items()
-            if config is not None
-        }
-
-        # Build cache keys for batch retrieval
-        cache_keys = []
-        for provider, config in provider_configs.items():
-            cache_keys.append(f"provider_spend:{provider}:{config.time_period}")
-
-        # Fetch current spend for all providers using batch cache
+            budget_limit, _, spend_key, _ = compiled_budget
+            provider_budget_limits[provider] = budget_limit
+            cache_keys.append(spend_key)
+
+        # No deployment belongs to a budgeted provider - nothing to filter, skip the spend lookup
+        if len(provider_budget_limits) == 0:
+            return healthy_deployments
+
+        # Fetch current spend for all providers from the in-memory cache
+        # in-memory spend is incremented on every success and synced with Redis every DEFAULT_REDIS_SYNC_INTERVAL, so no Redis call is needed here
         _current_spends = await self.router_cache.async_batch_get_cache(
             keys=cache_keys,
             parent_otel_span=parent_otel_span,
+            local_only=True,
         )
-        current_spends: List = _current_spends or [0.0] * len(provider_configs)
+        current_spends: List = _current_spends or [0.0] * len(provider_budget_limits)
 
         # Map providers to their current spend values
-        provider_spend_map: Dict[str, float] = {}
-        for idx, provider in enumerate(provider_configs.keys()):
-            provider_spend_map[provider] = float(current_spends[idx] or 0.0)
+        provider_spend_map: Dict[str, float] = dict(
+            zip(
+                provider_budget_limits,
+                (float(spend or 0.0) for spend in current_spends),
+            )
+        )
 
-        # Filter healthy deployments based on budget constraints
+        # Check each budgeted provider once
+        # {"openai": False, "anthropic": True} if openai spend >= openai budget limit
+        provider_within_budget: Dict[str, bool] = {}
         deployment_above_budget_info: str = ""  # used to return in error message
-        for deployment in healthy_deployments:
-            provider = self._get_llm_provider_for_deployment(deployment)
-            if provider is None:
-                continue
-            budget_config = provider_configs.get(provider)
-
-            if not budget_config:
-                continue
-
-            current_spend = provider_spend_map.get(provider, 0.0)
-            budget_limit = budget_config.budget_limit
+        for provider, budget_limit in provider_budget_limits.items():
+            current_spend = provider_spend_map[provider]
 
             verbose_router_logger.debug(
-                f"Current spend for {provider}: {current_spend}, budget limit: {budget_limit}"
+                "Current spend for %s: %s, budget limit: %s",
+                provider,
+                current_spend,
+                budget_limit,
             )
             self._track_provider_remaining_budget_prometheus(
                 provider=provider,
@@ -169,8 +239,15 @@ class ProviderBudgetLimiting(CustomLogger):
                 debug_msg = f"Exceeded budget for provider {provider}: {current_spend} >= {budget_limit}"
                 verbose_router_logger.debug(debug_msg)
                 deployment_above_budget_info += f"{debug_msg}\n"
+                provider_within_budget[provider] = False
+            else:
+                provider_within_budget[provider] = True
+
+        # Filter healthy deployments based on budget constraints - 1 dict lookup per deployment
+        # deployments with an unknown or unbudgeted provider are not in provider_within_budget, these are kept
+        for deployment, provider in deployment_providers:
+            if provider is not None and provider_within_budget.get(provider) is False:
                 continue
-
             potential_deployments.append(deployment)
 
         if len(potential_deployments) == 0:
@@ -191,8 +268,8 @@ class ProviderBudgetLimiting(CustomLogger):
         """
         budget_start = await self.router_cache.async_get_cache(start_time_key)
         if budget_start is None:
-            await self.router_cache.async_set_cache(
-                key=start_time_key, value=current_time, ttl=ttl_seconds
+            await self._set_cache_and_write_to_redis_in_background(
+                cache_list=[(start_time_key, current_time)], ttl=ttl_seconds
             )
             return current_time
         return float(budget_start)
@@ -212,19 +289,51 @@ class ProviderBudgetLimiting(CustomLogger):
         - The budget does not exist in cache, so we need to set it
         - The budget window has expired, so we need to reset everything
 
-        Does 2 things:
+        Does 2 things (written to Redis in 1 pipeline):
         - stores key: `provider_spend:{provider}:1d`, value: response_cost
         - stores key: `provider_budget_start_time:{provider}`, value: current_time.
             This stores the start time of the new budget window
         """
-        await self.router_cache.async_set_cache(
-            key=spend_key, value=response_cost, ttl=ttl_seconds
-        )
-        await self.router_cache.async_set_cache(
-            key=start_time_key, value=current_time, ttl=ttl_seconds
+        await self._set_cache_and_write_to_redis_in_background(
+            cache_list=[(spend_key, response_cost), (start_time_key, current_time)],
+            ttl=ttl_seconds,
         )
         return current_time
 
+    async def _set_cache_and_write_to_redis_in_background(
+        self, cache_list: List[Tuple[str, float]], ttl: int
+    ):
+        """
+        Sets the values in the in-memory cache, and writes them to Redis in a single pipeline in a background task
+
+        Keeps the Redis round-trip off the request's logging path. If DEFAULT_MAX_PENDING_REDIS_WRITES writes are already in flight, the Redis write is awaited instead.
+        """
+        await self.router_cache.in_memory_cache.async_set_cache_pipeline(
+            cache_list=cache_list, ttl=ttl
+        )
+        if self.router_cache.redis_cache is None:
+            return
+
+        redis_write = self._write_to_redis(cache_list=cache_list, ttl=ttl)
+        if len(self._pending_redis_writes) >= DEFAULT_MAX_PENDING_REDIS_WRITES:
+            await redis_write
+            return
+        task = asyncio.create_task(redis_write)
+        self._pending_redis_writes.add(task)
+        task.add_done_callback(self._pending_redis_writes.discard)
+
+    async def _write_to_redis(self, cache_list: List[Tuple[str, float]], ttl: int):
+        if self.router_cache.redis_cache is None:
+            return
+        try:
+            await self.router_cache.redis_cache.async_set_cache_pipeline(
+                cache_list=cache_list, ttl=ttl
+            )
+        except Exception as e:
+            verbose_router_logger.error(
+                f"Error writing provider budget keys {cache_list} to Redis: {str(e)}"
+            )
+
     async def _increment_spend_in_current_window(
         self, spend_key: str, response_cost: float, ttl: int
     ):
@@ -265,17 +374,18 @@ class ProviderBudgetLimiting(CustomLogger):
         if custom_llm_provider is None:
             raise ValueError("custom_llm_provider is required")
 
-        budget_config = self._get_budget_config_for_provider(custom_llm_provider)
-        if budget_config is None:
-            raise ValueError(
-                f"No budget config found for provider {custom_llm_provider}, self.provider_budget_config: {self.provider_budget_config}"
+        compiled_budget = self._compiled_budget.get(custom_llm_provider)
+        if compiled_budget is None:
+            # provider has no budget - nothing to track
+            verbose_router_logger.debug(
+                "No budget config found for provider %s, skipping spend tracking",
+                custom_llm_provider,
             )
-
-        spend_key = f"provider_spend:{custom_llm_provider}:{budget_config.time_period}"
-        start_time_key = f"provider_budget_start_time:{custom_llm_provider}"
+            return
+        _, time_period, spend_key, start_time_key = compiled_budget
 
         current_time = datetime.now(timezone.utc).timestamp()
-        ttl_seconds = duration_in_seconds(budget_config.time_period)
+        ttl_seconds = get_ttl_seconds(time_period)
 
         budget_start = await self._get_or_set_budget_start_time(
             start_time_key=start_time_key,
@@ -352,7 +462,9 @@ class ProviderBudgetLimiting(CustomLogger):
             if len(self.redis_increment_operation_queue) > 0:
                 asyncio.create_task(
                     self.router_cache.redis_cache.async_increment_pipeline(
-                        increment_list=self.redis_increment_operation_queue,
+                        increment_list=self._coalesce_increment_operations(
+                            self.redis_increment_operation_queue
+                        ),
                     )
                 )
 
@@ -363,6 +475,30 @@ class ProviderBudgetLimiting(CustomLogger):
                 f"Error syncing in-memory cache with Redis: {str(e)}"
             )
 
+    @staticmethod
+    def _coalesce_increment_operations(
+        increment_list: List[RedisPipelineIncrementOperation],
+    ) -> List[RedisPipelineIncrementOperation]:
+        """
+        Merge queued increments for the same key into a single operation
+
+        Under high traffic many requests hit the same provider within one sync interval, this sends 1 INCRBYFLOAT + EXPIRE per key instead of 1 per request.
+        The ttl of the most recent increment for a key is used.
+        """
+        coalesced: Dict[str, RedisPipelineIncrementOperation] = {}
+        for increment_op in increment_list:
+            existing_op = coalesced.get(increment_op["key"])
+            if existing_op is None:
+                coalesced[increment_op["key"]] = RedisPipelineIncrementOperation(
+                    key=increment_op["key"],
+                    increment_value=increment_op["increment_value"],
+                    ttl=increment_op["ttl"],
+                )
+            else:
+                existing_op["increment_value"] += increment_op["increment_value"]
+                existing_op["ttl"] = increment_op["ttl"]
+        return list(coalesced.values())
+
     async def _sync_in_memory_spend_with_redis(self):
         """
         Ensures in-memory cache is updated with latest Redis values for all provider spends.
@@ -385,11 +521,9 @@ class ProviderBudgetLimiting(CustomLogger):
             await self._push_in_memory_increments_to_redis()
 
             # 2. Fetch all current provider spend from Redis to update in-memory cache
-            cache_keys = []
-            for provider, config in self.provider_budget_config.items():
-                if config is None:
-                    continue
-                cache_keys.append(f"provider_spend:{provider}:{config.time_period}")
+            cache_keys = [
+                spend_key for _, _, spend_key, _ in self._compiled_budget.values()
+            ]
 
             # Batch fetch current spend values from Redis
             redis_values = await self.router_cache.redis_cache.async_batch_get_cache(
@@ -412,19 +546,28 @@ class ProviderBudgetLimiting(CustomLogger):
                 f"Error syncing in-memory cache with Redis: {str(e)}"
             )
 
-    def _get_budget_config_for_provider(
-        self, provider: str
-    ) -> Optional[ProviderBudgetInfo]:
-        return self.provider_budget_config.get(provider, None)
+    @staticmethod
+    def clear_provider_resolution_cache():
+        """
+        Clears the cached provider resolution (`_resolve_provider`)
+
+        Call this when litellm's global model / provider lists change, e.g. after `litellm.register_model`
+        """
+        _resolve_provider.cache_clear()
 
     def _get_llm_provider_for_deployment(self, deployment: Dict) -> Optional[str]:
+        """
+        Returns the custom_llm_provider for a deployment
+
+        Resolution is cached by the litellm_params that decide the provider (see `_resolve_provider`), not by deployment id - a deployment can be updated in place with the same id
+        """
         try:
-            _litellm_params: LiteLLM_Params = LiteLLM_Params(
-                **deployment.get("litellm_params", {"model": ""})
-            )
-            _, custom_llm_provider, _, _ = litellm.get_llm_provider(
-                model=_litellm_params.model,
-                litellm_params=_litellm_params,
+            # read the raw litellm_params - deployments are validated at router init, no need to build a LiteLLM_Params on every request
+            _litellm_params: Dict = deployment.get("litellm_params") or {}
+            custom_llm_provider = _resolve_provider(
+                model=_litellm_params.get("model", ""),
+                custom_llm_provider=_litellm_params.get("custom_llm_provider"),
+                api_base=_litellm_params.get("api_base"),
             )
         except Exception:
             verbose_router_logger.error(
@@ -198,37 +198,6 @@ async def test_get_llm_provider_for_deployment():
     assert provider_budget._get_llm_provider_for_deployment(unknown_deployment) is None
 
 
-@pytest.mark.asyncio
-async def test_get_budget_config_for_provider():
-    """
-    Test the _get_budget_config_for_provider helper method
-
-    """
-    cleanup_redis()
-    config = {
-        "openai": ProviderBudgetInfo(time_period="1d", budget_limit=100),
-        "anthropic": ProviderBudgetInfo(time_period="7d", budget_limit=500),
-    }
-
-    provider_budget = ProviderBudgetLimiting(
-        router_cache=DualCache(), provider_budget_config=config
-    )
-
-    # Test existing providers
-    openai_config = provider_budget._get_budget_config_for_provider("openai")
-    assert openai_config is not None
-    assert openai_config.time_period == "1d"
-    assert openai_config.budget_limit == 100
-
-    anthropic_config = provider_budget._get_budget_config_for_provider("anthropic")
-    assert anthropic_config is not None
-    assert anthropic_config.time_period == "7d"
-    assert anthropic_config.budget_limit == 500
-
-    # Test non-existent provider
-    assert provider_budget._get_budget_config_for_provider("unknown") is None
-
-
 @pytest.mark.asyncio
 async def test_prometheus_metric_tracking():
     """
@@ -476,3 +445,354 @@ async def test_sync_in_memory_spend_with_redis():
 
     assert float(openai_spend) == 50.0
     assert float(anthropic_spend) == 75.0
+
+
+@pytest.mark.asyncio
+async def test_get_llm_provider_for_deployment_after_deployment_update():
+    """
+    Test that updating a deployment's litellm_params in place (same model_info.id, e.g. via Router.upsert_deployment)
+    returns the provider of the updated params
+    """
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(), provider_budget_config={}
+    )
+
+    deployment = {
+        "litellm_params": {"model": "openai/gpt-4"},
+        "model_info": {"id": "oa"},
+    }
+    assert provider_budget._get_llm_provider_for_deployment(deployment) == "openai"
+
+    deployment["litellm_params"] = {"model": "anthropic/claude-3-5-sonnet-20240620"}
+    assert provider_budget._get_llm_provider_for_deployment(deployment) == "anthropic"
+
+
+@pytest.mark.asyncio
+async def test_resolve_provider_is_cached_by_model():
+    """
+    Test that deployments sharing the same model + api_base only resolve the provider once
+    """
+    from unittest.mock import patch
+
+    from litellm.router_strategy.provider_budgets import _resolve_provider
+
+    _resolve_provider.cache_clear()
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(), provider_budget_config={}
+    )
+
+    deployments = [
+        {
+            "litellm_params": {"model": "anthropic/claude-3-5-sonnet-20240620"},
+            "model_info": {"id": f"anthropic-model-id-{i}"},
+        }
+        for i in range(3)
+    ]
+
+    with patch.object(
+        litellm, "get_llm_provider", wraps=litellm.get_llm_provider
+    ) as mock_get_llm_provider:
+        for deployment in deployments:
+            assert (
+                provider_budget._get_llm_provider_for_deployment(deployment)
+                == "anthropic"
+            )
+
+    assert mock_get_llm_provider.call_count == 1
+    assert _resolve_provider.cache_info().currsize == 1
+
+
+@pytest.mark.asyncio
+async def test_filter_deployments_skips_spend_lookup_without_budgeted_providers():
+    """
+    If none of the deployments belong to a budgeted provider, the deployments are returned as-is
+    without reading provider spend from the cache
+    """
+    from unittest.mock import AsyncMock
+
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "anthropic": ProviderBudgetInfo(time_period="1d", budget_limit=100)
+        },
+    )
+    provider_budget.router_cache.async_batch_get_cache = AsyncMock()
+
+    healthy_deployments = [
+        {
+            "litellm_params": {"model": "openai/gpt-4o-mini"},
+            "model_info": {"id": "openai-model-id"},
+        }
+    ]
+
+    filtered_deployments = await provider_budget.async_filter_deployments(
+        healthy_deployments=healthy_deployments
+    )
+
+    assert filtered_deployments == healthy_deployments
+    provider_budget.router_cache.async_batch_get_cache.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_handle_new_budget_window_writes_to_redis_in_background():
+    """
+    Test that _handle_new_budget_window updates the in-memory cache immediately
+    and writes both keys to Redis in a single pipeline in a background task
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    mock_redis_cache = MagicMock(spec=RedisCache)
+    mock_redis_cache.async_set_cache_pipeline = AsyncMock()
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(redis_cache=mock_redis_cache),
+        provider_budget_config={},
+    )
+
+    spend_key = "provider_spend:openai:1d"
+    start_time_key = "provider_budget_start_time:openai"
+
+    await provider_budget._handle_new_budget_window(
+        spend_key=spend_key,
+        start_time_key=start_time_key,
+        current_time=1000.0,
+        response_cost=0.5,
+        ttl_seconds=86400,
+    )
+
+    # in-memory cache is updated before returning
+    in_memory_cache = provider_budget.router_cache.in_memory_cache
+    assert await in_memory_cache.async_get_cache(spend_key) == 0.5
+    assert await in_memory_cache.async_get_cache(start_time_key) == 1000.0
+    assert len(provider_budget._pending_redis_writes) == 1
+
+    await asyncio.gather(*provider_budget._pending_redis_writes)
+
+    mock_redis_cache.async_set_cache_pipeline.assert_called_once_with(
+        cache_list=[(spend_key, 0.5), (start_time_key, 1000.0)], ttl=86400
+    )
+    assert len(provider_budget._pending_redis_writes) == 0
+
+
+def test_coalesce_increment_operations():
+    """
+    Test that queued increments for the same key are merged into one operation
+    """
+    from litellm.caching.redis_cache import RedisPipelineIncrementOperation
+
+    increment_list = [
+        RedisPipelineIncrementOperation(
+            key="provider_spend:openai:1d", increment_value=0.5, ttl=100
+        ),
+        RedisPipelineIncrementOperation(
+            key="provider_spend:anthropic:1d", increment_value=1.0, ttl=200
+        ),
+        RedisPipelineIncrementOperation(
+            key="provider_spend:openai:1d", increment_value=0.25, ttl=90
+        ),
+    ]
+
+    coalesced = ProviderBudgetLimiting._coalesce_increment_operations(increment_list)
+
+    assert coalesced == [
+        {"key": "provider_spend:openai:1d", "increment_value": 0.75, "ttl": 90},
+        {"key": "provider_spend:anthropic:1d", "increment_value": 1.0, "ttl": 200},
+    ]
+    # queued operations are not mutated
+    assert increment_list[0]["increment_value"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_filter_deployments_removes_providers_over_budget():
+    """
+    Test that deployments of a provider that exceeded its budget are filtered out,
+    using the spend tracked in the in-memory cache
+    """
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "openai": ProviderBudgetInfo(time_period="1d", budget_limit=10),
+            "anthropic": ProviderBudgetInfo(time_period="7d", budget_limit=10),
+        },
+    )
+    await provider_budget.router_cache.async_set_cache(
+        key="provider_spend:openai:1d", value=10.5
+    )
+    await provider_budget.router_cache.async_set_cache(
+        key="provider_spend:anthropic:7d", value=2.0
+    )
+
+    openai_deployment = {
+        "litellm_params": {"model": "openai/gpt-4o-mini"},
+        "model_info": {"id": "openai-model-id"},
+    }
+    anthropic_deployment = {
+        "litellm_params": {"model": "anthropic/claude-3-5-sonnet-20240620"},
+        "model_info": {"id": "anthropic-model-id"},
+    }
+
+    filtered_deployments = await provider_budget.async_filter_deployments(
+        healthy_deployments=[openai_deployment, anthropic_deployment]
+    )
+    assert filtered_deployments == [anthropic_deployment]
+
+    with pytest.raises(ValueError) as exc_info:
+        await provider_budget.async_filter_deployments(
+            healthy_deployments=[openai_deployment]
+        )
+    assert "Exceeded budget for provider openai" in str(exc_info.value)
+
+
+def test_get_ttl_seconds():
+    """
+    Test that fixed length time periods are cached, and calendar based periods are not
+    """
+    from litellm.router_strategy.provider_budgets import _TTL_CACHE, get_ttl_seconds
+
+    assert get_ttl_seconds("1d") == 86400
+    assert get_ttl_seconds("2h") == 7200
+    assert get_ttl_seconds("30m") == 1800
+    assert _TTL_CACHE["1d"] == 86400
+
+    assert get_ttl_seconds("1mo") > 0
+    assert "1mo" not in _TTL_CACHE
+
+
+@pytest.mark.asyncio
+async def test_filter_deployments_checks_each_provider_once():
+    """
+    Test that the budget check (and prometheus tracking) runs once per provider,
+    not once per deployment
+    """
+    from unittest.mock import MagicMock
+
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "openai": ProviderBudgetInfo(time_period="1d", budget_limit=10),
+        },
+    )
+    await provider_budget.router_cache.async_set_cache(
+        key="provider_spend:openai:1d", value=10.5
+    )
+    provider_budget._track_provider_remaining_budget_prometheus = MagicMock()
+
+    healthy_deployments = [
+        {
+            "litellm_params": {"model": "openai/gpt-4o-mini"},
+            "model_info": {"id": f"openai-model-id-{i}"},
+        }
+        for i in range(3)
+    ]
+
+    with pytest.raises(ValueError) as exc_info:
+        await provider_budget.async_filter_deployments(
+            healthy_deployments=healthy_deployments
+        )
+
+    assert str(exc_info.value).count("Exceeded budget for provider openai") == 1
+    provider_budget._track_provider_remaining_budget_prometheus.assert_called_once_with(
+        provider="openai", spend=10.5, budget_limit=10
+    )
+
+
+@pytest.mark.asyncio
+async def test_filter_deployments_keeps_unbudgeted_providers_in_mixed_group():
+    """
+    Test that deployments of providers without a budget are kept when the group also has budgeted providers
+    """
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "openai": ProviderBudgetInfo(time_period="1d", budget_limit=10),
+        },
+    )
+
+    azure_deployment = {
+        "litellm_params": {"model": "azure/gpt-4o", "api_base": "test"},
+        "model_info": {"id": "azure-model-id"},
+    }
+    openai_deployment = {
+        "litellm_params": {"model": "openai/gpt-4o-mini"},
+        "model_info": {"id": "openai-model-id"},
+    }
+
+    # openai within budget - both deployments kept
+    filtered_deployments = await provider_budget.async_filter_deployments(
+        healthy_deployments=[azure_deployment, openai_deployment]
+    )
+    assert filtered_deployments == [azure_deployment, openai_deployment]
+
+    # openai over budget - only the unbudgeted azure deployment is kept
+    await provider_budget.router_cache.async_set_cache(
+        key="provider_spend:openai:1d", value=10.5
+    )
+    filtered_deployments = await provider_budget.async_filter_deployments(
+        healthy_deployments=[azure_deployment, openai_deployment]
+    )
+    assert filtered_deployments == [azure_deployment]
+
+
+@pytest.mark.asyncio
+async def test_log_success_event_skips_unbudgeted_provider():
+    """
+    Test that a successful call to a provider without a budget is not tracked and does not raise
+    """
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "openai": ProviderBudgetInfo(time_period="1d", budget_limit=10),
+        },
+    )
+
+    await provider_budget.async_log_success_event(
+        kwargs={
+            "standard_logging_object": {"response_cost": 0.5},
+            "litellm_params": {"custom_llm_provider": "azure"},
+        },
+        response_obj=None,
+        start_time=None,
+        end_time=None,
+    )
+
+    assert provider_budget.redis_increment_operation_queue == []
+    assert provider_budget.router_cache.in_memory_cache.cache_dict == {}
+
+
+def test_router_set_model_list_clears_resolve_provider_cache():
+    """
+    Test that creating router deployments (which calls litellm.register_model) clears the cached provider resolution
+    """
+    from litellm.router_strategy.provider_budgets import _resolve_provider
+
+    router = Router(model_list=[])
+
+    _resolve_provider("openai/gpt-4", None, None)
+    assert _resolve_provider.cache_info().currsize > 0
+
+    router.set_model_list(
+        model_list=[
+            {
+                "model_name": "gpt-4",
+                "litellm_params": {"model": "openai/gpt-4", "api_key": "test"},
+            }
+        ]
+    )
+    assert _resolve_provider.cache_info().currsize == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_time_period_does_not_raise_on_init():
+    """
+    Test that an unsupported time_period is logged, not raised, when initializing provider budgets
+    """
+    from litellm.router_strategy.provider_budgets import _TTL_CACHE
+
+    provider_budget = ProviderBudgetLimiting(
+        router_cache=DualCache(),
+        provider_budget_config={
+            "openai": ProviderBudgetInfo(time_period="1w", budget_limit=100),
+        },
+    )
+
+    assert "openai" in provider_budget._compiled_budget
+    assert "1w" not in _TTL_CACHE